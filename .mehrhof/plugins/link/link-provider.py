@@ -1,40 +1,200 @@
 #!/usr/bin/env python3
 """Link provider plugin for mehr - loads task content from any URL."""
 
+import codecs
 import hashlib
 import json
 import re
+import socket
 import sys
+import threading
+import time
+import traceback
 import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from email.message import Message
+from functools import partial
 from html.parser import HTMLParser
 from urllib.parse import urlparse
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is optional, fall back to lxml or the stdlib parser
+    LexborHTMLParser = None
 
-class HTMLTextExtractor(HTMLParser):
-    """Extract text content from HTML, stripping scripts and styles."""
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml is optional, fall back to the stdlib parser
+    lxml_etree = None
+
+try:
+    import urllib3
+except ImportError:  # urllib3 is optional, fall back to urllib.request
+    urllib3 = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
+
+USER_AGENT = "mehr-link-provider/1.0"
+
+# Bytes read from the network per chunk when streaming a response
+CHUNK_SIZE = 32768
+
+# Most HTML bytes parsed for title and text; snapshots keep the full body
+MAX_HTML_BYTES = 512 * 1024
+
+# Requests handled concurrently; matches the connection pool size
+MAX_WORKERS = 16
+
+# Bytes read from stdin at a time when reading JSON-RPC requests
+STDIN_CHUNK_SIZE = 65536
+
+# Responses are written as UTF-8 bytes straight to the binary stdout;
+# OUTPUT_LOCK serializes writes from concurrent request handlers
+STDOUT = sys.stdout.buffer
+OUTPUT_LOCK = threading.Lock()
+
+# Seconds a fetched response is served from memory before revalidating
+CACHE_TTL = 300
+
+# Maximum number of responses kept in the cache
+CACHE_SIZE = 64
+
+# Largest body kept in the cache; bigger responses are streamed uncached
+CACHE_MAX_BODY = 256 * 1024
+
+# Recent responses: url -> (expires, etag, body, content_type)
+CACHE = {}
+CACHE_LOCK = threading.Lock()
+
+# Seconds a resolved host address is reused before resolving it again
+DNS_TTL = 300
+
+# Maximum number of resolved addresses kept
+DNS_CACHE_SIZE = 1024
+
+# Resolved addresses: getaddrinfo arguments -> (expires, result)
+DNS_CACHE = {}
+
+GITHUB_ISSUE_RE = re.compile(r"https://github\.com/([^/]+)/([^/]+)/(issues|pull)/(\d+)")
+PASTEBIN_ID_RE = re.compile(r"pastebin\.com/(?:raw/)?([a-zA-Z0-9]+)")
+PAGE_EXTENSION_RE = re.compile(r"\.(html?|php|aspx?|jsp|md|txt)$", re.I)
+NON_KEY_CHARS_RE = re.compile(r"[^a-zA-Z0-9_-]")
+DASHES_RE = re.compile(r"-+")
+NOSCRIPT_RE = re.compile(r"<noscript\b.*?</noscript\s*>", re.I | re.S)
+MARKDOWN_TITLE_RE = re.compile(r"^[ \t]*# [ \t]*(\S.*)", re.M)
+
+# Characters searched for a markdown title; headings sit near the top
+MARKDOWN_TITLE_SCAN = 8192
+
+# Shared connection pool, so repeated fetches from the same host reuse
+# keep-alive connections for the lifetime of the plugin process
+POOL = None
+if urllib3 is not None:
+    POOL = urllib3.PoolManager(
+        maxsize=MAX_WORKERS,
+        # Follow as many redirects as urllib.request does; retry failed
+        # connects, but don't let a hanging host multiply the read timeout
+        retries=urllib3.Retry(connect=3, read=1, redirect=10, backoff_factor=0.2),
+    )
+
+
+getaddrinfo_uncached = socket.getaddrinfo
+
+
+def getaddrinfo_cached(*args, **kwargs):
+    """socket.getaddrinfo with results reused for DNS_TTL seconds."""
+    key = (args, tuple(sorted(kwargs.items())))
+    cached = DNS_CACHE.get(key)
+    now = time.monotonic()
+    if cached is not None and cached[0] > now:
+        return list(cached[1])
+
+    result = getaddrinfo_uncached(*args, **kwargs)
+    if len(DNS_CACHE) >= DNS_CACHE_SIZE:
+        DNS_CACHE.clear()
+    DNS_CACHE[key] = (now + DNS_TTL, result)
+    return list(result)
+
+
+def json_loads(data):
+    """Parse JSON from str or bytes."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # orjson rejects some JSON that json accepts, e.g. lone surrogate
+            # escapes and integers wider than 64 bits
+            pass
+    return json.loads(data)
+
+
+def json_dumps(obj, indent=False):
+    """Serialize obj to a JSON string, optionally indented by 2 spaces."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def json_dumpline(obj):
+    """Serialize obj to a newline-terminated line of UTF-8 encoded JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    try:
+        return (json.dumps(obj, separators=(",", ":"), ensure_ascii=False) + "\n").encode()
+    except UnicodeEncodeError:
+        # Lone surrogates can't be encoded as UTF-8, only escaped
+        return (json.dumps(obj, separators=(",", ":")) + "\n").encode()
+
+
+class HTMLTextTarget:
+    """Collect text content from HTML parse events, stripping scripts and styles.
+
+    Implements the lxml parser target interface (start/end/data/close). Text
+    may arrive split across several data events when the document is fed in
+    chunks, so it is buffered until the next tag.
+    """
+
+    skip_tags = frozenset(("script", "style", "noscript", "svg", "path"))
 
     def __init__(self):
-        super().__init__()
         self.text_parts = []
+        self.pending = []
         self.title = ""
         self.in_title = False
-        self.skip_tags = {"script", "style", "noscript", "svg", "path"}
         self.skip_depth = 0
 
-    def handle_starttag(self, tag, attrs):
+    def start(self, tag, attrs):
+        self.flush()
         if tag in self.skip_tags:
             self.skip_depth += 1
         if tag == "title":
             self.in_title = True
 
-    def handle_endtag(self, tag):
+    def end(self, tag):
+        self.flush()
         if tag in self.skip_tags and self.skip_depth > 0:
             self.skip_depth -= 1
         if tag == "title":
             self.in_title = False
 
-    def handle_data(self, data):
+    def data(self, data):
+        self.pending.append(data)
+
+    def flush(self):
+        if not self.pending:
+            return
+        data = "".join(self.pending)
+        self.pending = []
         if self.in_title:
             self.title = data.strip()
         elif self.skip_depth == 0:
@@ -42,44 +202,121 @@ class HTMLTextExtractor(HTMLParser):
             if text:
                 self.text_parts.append(text)
 
+    def close(self):
+        self.flush()
+        return self.title, self.get_text()
+
     def get_text(self):
         return "\n".join(self.text_parts)
 
 
-def extract_html_content(html):
-    """Extract title and text from HTML."""
-    parser = HTMLTextExtractor()
+class HTMLTextExtractor(HTMLTextTarget, HTMLParser):
+    """Extract text content from HTML with the stdlib parser."""
+
+    def __init__(self):
+        HTMLTextTarget.__init__(self)
+        HTMLParser.__init__(self)
+
+    handle_starttag = HTMLTextTarget.start
+    handle_endtag = HTMLTextTarget.end
+    handle_data = HTMLTextTarget.data
+
+    def close(self):
+        HTMLParser.close(self)
+        return HTMLTextTarget.close(self)
+
+
+def extract_html_content_lexbor(html):
+    """Extract title and text from HTML using selectolax's lexbor parser."""
+    # With scripting off, lexbor moves the text of a <noscript> in <head> into
+    # <body>, where strip_tags can no longer find it. Leave the element empty
+    # so the text on either side still ends up on separate lines.
+    tree = LexborHTMLParser(NOSCRIPT_RE.sub("<noscript></noscript>", html))
+    node = tree.css_first("title")
+    title = node.text(strip=True) if node else ""
+    if tree.body is None:
+        return title, ""
+    if "<!--" in html:
+        # The parser targets never see comments, so text around one is a
+        # single piece of text
+        for node in list(tree.body.traverse(include_text=True)):
+            if node.tag == "-comment":
+                node.decompose()
+        tree.merge_text_nodes()
+    tree.strip_tags(list(HTMLTextTarget.skip_tags))
+
+    # One line per non-blank text node, as HTMLTextTarget collects them
+    text_parts = []
+    for node in tree.body.traverse(include_text=True):
+        if node.tag == "-text":
+            text = node.text_content.strip()
+            if text:
+                text_parts.append(text)
+    return title, "\n".join(text_parts)
+
+
+def extract_html_content(chunks):
+    """Extract title and text from HTML, parsing chunks as they arrive."""
+    if LexborHTMLParser is not None:
+        # lexbor parses a complete document, but fast enough to make up for
+        # not overlapping with the download
+        return extract_html_content_lexbor("".join(chunks))
+
+    if lxml_etree is not None:
+        target = HTMLTextTarget()
+        parser = lxml_etree.HTMLParser(target=target)
+    else:
+        target = parser = HTMLTextExtractor()
+
+    for chunk in chunks:
+        try:
+            parser.feed(chunk)
+        except Exception:
+            pass
     try:
-        parser.feed(html)
+        parser.close()
     except Exception:
         pass
-    return parser.title, parser.get_text()
+    target.flush()
+    return target.title, target.get_text()
 
 
 def extract_markdown_title(content):
     """Extract first heading from markdown."""
-    for line in content.split("\n"):
-        line = line.strip()
-        if line.startswith("# "):
-            return line[2:].strip()
-    return ""
+    match = MARKDOWN_TITLE_RE.search(content, 0, MARKDOWN_TITLE_SCAN)
+    return match.group(1).strip() if match else ""
+
 
+def http_get(url, accept, etag=""):
+    """Send a GET request, returns the open response.
 
-def fetch_url(url):
-    """Fetch content from URL, returns (content, content_type)."""
-    req = urllib.request.Request(url)
-    req.add_header("User-Agent", "mehr-link-provider/1.0")
-    req.add_header("Accept", "text/html,text/plain,text/markdown,application/json,*/*")
+    Returns None if etag is given and the server answers 304 Not Modified.
+    """
+    headers = {"User-Agent": USER_AGENT, "Accept": accept}
+    if etag:
+        headers["If-None-Match"] = etag
 
+    if POOL is not None:
+        try:
+            resp = POOL.request("GET", url, headers=headers, timeout=30, preload_content=False)
+        except urllib3.exceptions.MaxRetryError as e:
+            raise Exception(f"URL error: {e.reason}")
+        except Exception as e:
+            raise Exception(f"Fetch error: {str(e)}")
+        if resp.status == 304 or resp.status >= 400:
+            # Drain the body so the connection goes back to the pool
+            resp.drain_conn()
+            if resp.status == 304:
+                return None
+            raise Exception(f"HTTP {resp.status}: {resp.reason}")
+        return resp
+
+    req = urllib.request.Request(url, headers=headers)
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            content_type = resp.headers.get("Content-Type", "text/plain")
-            charset = "utf-8"
-            if "charset=" in content_type:
-                charset = content_type.split("charset=")[-1].split(";")[0].strip()
-            content = resp.read().decode(charset, errors="replace")
-            return content, content_type
+        return urllib.request.urlopen(req, timeout=30)
     except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None
         raise Exception(f"HTTP {e.code}: {e.reason}")
     except urllib.error.URLError as e:
         raise Exception(f"URL error: {e.reason}")
@@ -87,52 +324,172 @@ def fetch_url(url):
         raise Exception(f"Fetch error: {str(e)}")
 
 
-def is_github_issue_url(url):
-    """Check if URL is a GitHub issue or PR."""
-    return bool(re.match(r"https://github\.com/[^/]+/[^/]+/(issues|pull)/\d+", url))
+def cache_response(url, etag, body, content_type):
+    """Store a fetched response, evicting the oldest entry when full.
 
+    Expired entries without an ETag can't be revalidated, so they are
+    dropped here as well.
+    """
+    now = time.monotonic()
+    with CACHE_LOCK:
+        for key in [k for k, v in CACHE.items() if v[0] <= now and not v[1]]:
+            del CACHE[key]
+        CACHE.pop(url, None)
+        CACHE[url] = (now + CACHE_TTL, etag, body, content_type)
+        if len(CACHE) > CACHE_SIZE:
+            del CACHE[next(iter(CACHE))]
 
-def fetch_github_issue(url):
-    """Fetch GitHub issue via API for better content."""
-    # Convert web URL to API URL
-    match = re.match(r"https://github\.com/([^/]+)/([^/]+)/(issues|pull)/(\d+)", url)
-    if not match:
+
+def iter_body(url, resp, content_type):
+    """Yield the response body in chunks, caching it once fully read.
+
+    Bodies larger than CACHE_MAX_BODY are not kept, so streaming them
+    holds only one chunk in memory at a time.
+    """
+    parts = []
+    size = 0
+    try:
+        for chunk in iter(lambda: resp.read(CHUNK_SIZE), b""):
+            if parts is not None:
+                size += len(chunk)
+                if size > CACHE_MAX_BODY:
+                    parts = None
+                else:
+                    parts.append(chunk)
+            yield chunk
+    except Exception as e:
+        raise Exception(f"Fetch error: {str(e)}")
+    if parts is not None:
+        cache_response(url, resp.headers.get("ETag", ""), b"".join(parts), content_type)
+
+
+@contextmanager
+def open_url(url, accept="text/html,text/plain,text/markdown,application/json,*/*"):
+    """Open URL for streaming, yields (chunks, mime_type, charset).
+
+    Responses are served from CACHE for CACHE_TTL seconds, then revalidated
+    with If-None-Match so an unchanged resource costs a single 304.
+    """
+    cached = CACHE.get(url)
+    resp = None
+    if cached is None or cached[0] <= time.monotonic():
+        if cached is not None and not cached[1]:
+            cached = None
+        resp = http_get(url, accept, cached[1] if cached else "")
+        if resp is None:
+            if cached is None:
+                raise Exception("HTTP 304: Not Modified")
+            cache_response(url, *cached[1:])
+
+    if resp is None:
+        chunks, content_type = iter((cached[2],)), cached[3]
+    else:
+        content_type = resp.headers.get("Content-Type", "text/plain")
+        chunks = iter_body(url, resp, content_type)
+
+    mime_type, charset = parse_content_type(content_type)
+    try:
+        yield chunks, mime_type, charset
+    finally:
+        if resp is not None:
+            resp.close()
+
+
+def parse_content_type(value):
+    """Parse a Content-Type header, returns (mime_type, charset)."""
+    msg = Message()
+    msg["Content-Type"] = value
+    return msg.get_content_type(), msg.get_content_charset("utf-8")
+
+
+def iter_text(chunks, charset, limit=None):
+    """Decode byte chunks incrementally, yielding text as it arrives.
+
+    Stops reading after limit bytes. A character cut in half by the limit
+    is dropped rather than flushed out as U+FFFD.
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError as e:
+        raise Exception(f"Fetch error: {str(e)}")
+    for chunk in chunks:
+        if limit is not None:
+            if len(chunk) >= limit:
+                yield decoder.decode(chunk[:limit])
+                return
+            limit -= len(chunk)
+        yield decoder.decode(chunk)
+    yield decoder.decode(b"", final=True)
+
+
+def is_indented_json(content):
+    """Cheap check for JSON that is already laid out over indented lines."""
+    head = content[:256]
+    return "\n " in head or "\n\t" in head
+
+
+def decode_body(body, charset):
+    """Decode a complete response body in one pass."""
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError as e:
+        raise Exception(f"Fetch error: {str(e)}")
+
+
+def fetch_bytes(url, accept="text/html,text/plain,text/markdown,application/json,*/*"):
+    """Fetch raw body from URL, returns (body, mime_type, charset)."""
+    with open_url(url, accept) as (chunks, mime_type, charset):
+        return b"".join(chunks), mime_type, charset
+
+
+def match_github_issue(url):
+    """Match a GitHub issue or PR URL, returns the match or None."""
+    # Cheap prefix check first: most URLs aren't GitHub at all
+    if not url.startswith("https://github.com/"):
         return None
+    return GITHUB_ISSUE_RE.match(url)
+
+
+def fetch_github_issue(match):
+    """Fetch GitHub issue via API for better content.
 
+    Takes the match_github_issue() result for the issue or PR URL.
+    """
+    # Convert web URL to API URL
     owner, repo, issue_type, number = match.groups()
     api_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{number}"
 
-    req = urllib.request.Request(api_url)
-    req.add_header("User-Agent", "mehr-link-provider/1.0")
-    req.add_header("Accept", "application/vnd.github+json")
-
     try:
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            data = json.loads(resp.read().decode("utf-8"))
-            title = data.get("title", "")
-            body = data.get("body", "") or ""
-            return {
-                "title": title,
-                "description": body,
-                "labels": [l.get("name") for l in data.get("labels", [])],
-                "status": "closed" if data.get("state") == "closed" else "open",
-                "number": number,
-                "repo": f"{owner}/{repo}",
-                "type": "pr" if issue_type == "pull" else "issue",
-            }
+        # Parse the raw bytes directly, no intermediate str
+        raw, _, _ = fetch_bytes(api_url, "application/vnd.github+json")
+        data = json_loads(raw)
+        title = data.get("title", "")
+        body = data.get("body", "") or ""
+        return {
+            "title": title,
+            "description": body,
+            "labels": [l.get("name") for l in data.get("labels", [])],
+            "status": "closed" if data.get("state") == "closed" else "open",
+            "number": number,
+            "repo": f"{owner}/{repo}",
+            "type": "pr" if issue_type == "pull" else "issue",
+        }
     except Exception:
         return None
 
 
-def extract_key_from_url(url):
-    """Extract a meaningful key from URL for branch naming."""
-    parsed = urlparse(url)
+def extract_key_from_url(url, parsed=None):
+    """Extract a meaningful key from URL for branch naming.
 
+    Pass parsed to reuse an existing urlparse() result for the URL.
+    """
     # For GitHub issues/PRs, this is handled separately
-    if is_github_issue_url(url):
-        match = re.match(r"https://github\.com/[^/]+/[^/]+/(issues|pull)/(\d+)", url)
-        if match:
-            return match.group(2)
+    match = match_github_issue(url)
+    if match:
+        return match.group(4)
+
+    if parsed is None:
+        parsed = urlparse(url)
 
     # For other URLs, try to extract meaningful identifier
     path = parsed.path.strip("/")
@@ -140,10 +497,10 @@ def extract_key_from_url(url):
         # Get last path segment, clean it up
         segment = path.split("/")[-1]
         # Remove common extensions
-        segment = re.sub(r"\.(html?|php|aspx?|jsp|md|txt)$", "", segment, flags=re.I)
+        segment = PAGE_EXTENSION_RE.sub("", segment)
         # Clean up non-alphanumeric chars
-        segment = re.sub(r"[^a-zA-Z0-9_-]", "-", segment)
-        segment = re.sub(r"-+", "-", segment).strip("-")
+        segment = NON_KEY_CHARS_RE.sub("-", segment)
+        segment = DASHES_RE.sub("-", segment).strip("-")
         if segment and len(segment) <= 50:
             return segment
 
@@ -158,7 +515,7 @@ def is_pastebin_url(url):
 
 def convert_pastebin_to_raw(url):
     """Convert Pastebin URL to raw content URL."""
-    match = re.search(r"pastebin\.com/(?:raw/)?([a-zA-Z0-9]+)", url)
+    match = PASTEBIN_ID_RE.search(url)
     if match:
         paste_id = match.group(1)
         return f"https://pastebin.com/raw/{paste_id}"
@@ -167,7 +524,9 @@ def convert_pastebin_to_raw(url):
 
 def generate_id(url):
     """Generate a short ID from URL."""
-    return hashlib.sha256(url.encode()).hexdigest()[:12]
+    # BLAKE2b emits the 12 hex chars directly instead of truncating a
+    # full SHA-256 digest; the ID is opaque, so only stability matters
+    return hashlib.blake2b(url.encode(), digest_size=6).hexdigest()
 
 
 def handle_init(params):
@@ -178,13 +537,8 @@ def handle_init(params):
 def handle_match(params):
     """Check if input matches our scheme."""
     inp = params.get("input", "")
-    # Match link: or url: prefix
-    if inp.startswith("link:") or inp.startswith("url:"):
-        return {"matches": True}
-    # Also match raw http:// or https:// URLs
-    if inp.startswith("http://") or inp.startswith("https://"):
-        return {"matches": True}
-    return {"matches": False}
+    # Match link: or url: prefix, and also raw http:// or https:// URLs
+    return {"matches": inp.startswith(("link:", "url:", "http://", "https://"))}
 
 
 def handle_parse(params):
@@ -192,10 +546,10 @@ def handle_parse(params):
     inp = params.get("input", "")
 
     # Strip scheme prefix
-    for prefix in ["link:", "url:"]:
-        if inp.startswith(prefix):
-            inp = inp[len(prefix) :]
-            break
+    if inp.startswith("link:"):
+        inp = inp[5:]
+    elif inp.startswith("url:"):
+        inp = inp[4:]
 
     # Validate URL
     parsed = urlparse(inp)
@@ -220,8 +574,10 @@ def handle_fetch(params):
     task_type = "task"
 
     # Try GitHub API for issues/PRs
-    if is_github_issue_url(url):
-        gh_data = fetch_github_issue(url)
+    github_match = match_github_issue(url)
+    if github_match:
+        external_key = github_match.group(4)
+        gh_data = fetch_github_issue(github_match)
         if gh_data:
             title = gh_data["title"]
             description = gh_data["description"]
@@ -237,32 +593,40 @@ def handle_fetch(params):
         if is_pastebin_url(url):
             fetch_url_to_use = convert_pastebin_to_raw(url)
 
-        content, content_type = fetch_url(fetch_url_to_use)
-
-        if "text/html" in content_type:
-            title, description = extract_html_content(content)
-        elif "text/markdown" in content_type or url.endswith(".md"):
-            title = extract_markdown_title(content)
-            description = content
-        elif "application/json" in content_type:
-            title = "JSON Content"
-            try:
-                description = json.dumps(json.loads(content), indent=2)
-            except Exception:
-                description = content
-        else:
-            # Plain text or other
-            title = extract_markdown_title(content) or "Linked Content"
-            description = content
+        with open_url(fetch_url_to_use) as (chunks, mime_type, charset):
+            if mime_type == "text/html":
+                # Parse while the body is still downloading
+                text = iter_text(chunks, charset, MAX_HTML_BYTES)
+                title, description = extract_html_content(text)
+            else:
+                content = decode_body(b"".join(chunks), charset)
+
+                if mime_type == "text/markdown" or url.endswith(".md"):
+                    title = extract_markdown_title(content)
+                    description = content
+                elif mime_type == "application/json":
+                    title = "JSON Content"
+                    description = content
+                    # Only round-trip compact JSON; indented JSON is already readable
+                    if not is_indented_json(content):
+                        try:
+                            description = json_dumps(json_loads(content), indent=True)
+                        except Exception:
+                            pass
+                else:
+                    # Plain text or other
+                    title = extract_markdown_title(content) or "Linked Content"
+                    description = content
 
     # Fallback title from URL
+    parsed = None
     if not title:
         parsed = urlparse(url)
         title = parsed.path.split("/")[-1] or parsed.netloc
 
     # Extract external key from URL if not already set
     if not external_key:
-        external_key = extract_key_from_url(url)
+        external_key = extract_key_from_url(url, parsed)
 
     return {
         "id": generate_id(url),
@@ -291,9 +655,19 @@ def handle_snapshot(params):
     if is_pastebin_url(url):
         fetch_url_to_use = convert_pastebin_to_raw(url)
 
-    content, _ = fetch_url(fetch_url_to_use)
+    body, _, charset = fetch_bytes(fetch_url_to_use)
+
+    return {"content": decode_body(body, charset)}
 
-    return {"content": content}
+
+HANDLERS = {
+    "provider.init": handle_init,
+    "provider.match": handle_match,
+    "provider.parse": handle_parse,
+    "provider.fetch": handle_fetch,
+    "provider.snapshot": handle_snapshot,
+    "shutdown": lambda p: {},
+}
 
 
 def handle_request(request):
@@ -301,46 +675,96 @@ def handle_request(request):
     method = request.get("method", "")
     params = request.get("params", {})
 
-    handlers = {
-        "provider.init": handle_init,
-        "provider.match": handle_match,
-        "provider.parse": handle_parse,
-        "provider.fetch": handle_fetch,
-        "provider.snapshot": handle_snapshot,
-        "shutdown": lambda p: {},
-    }
-
-    if method not in handlers:
+    handler = HANDLERS.get(method)
+    if handler is None:
         return None, {"code": -32601, "message": f"Method not found: {method}"}
 
     try:
-        result = handlers[method](params)
+        result = handler(params)
         return result, None
     except Exception as e:
         return None, {"code": -32000, "message": str(e)}
 
 
-def main():
-    """Main loop: read JSON-RPC from stdin, write to stdout."""
-    for line in sys.stdin:
-        line = line.strip()
-        if not line:
-            continue
+def write_response(request_id, result=None, error=None):
+    """Write one JSON-RPC response line to stdout."""
+    response = {"jsonrpc": "2.0", "id": request_id}
+    if error:
+        response["error"] = error
+    else:
+        response["result"] = result
+
+    line = json_dumpline(response)
+    with OUTPUT_LOCK:
+        STDOUT.write(line)
+        STDOUT.flush()
 
-        try:
-            request = json.loads(line)
-        except json.JSONDecodeError:
-            continue
 
-        result, error = handle_request(request)
+def handle_message(request):
+    """Handle one JSON-RPC request and write its response."""
+    result, error = handle_request(request)
+    write_response(request.get("id"), result, error)
+
+
+def report_failure(request, future):
+    """Log a request whose handler raised, and answer it with an internal error."""
+    exc = future.exception()
+    if exc is None:
+        return
+
+    traceback.print_exception(type(exc), exc, exc.__traceback__, file=sys.stderr)
+    sys.stderr.flush()
+    try:
+        write_response(
+            request.get("id"), error={"code": -32603, "message": f"Internal error: {exc}"}
+        )
+    except Exception:
+        traceback.print_exc(file=sys.stderr)
+
+
+def iter_lines(stream):
+    """Yield newline-delimited lines from a binary stream, read in large chunks."""
+    pending = b""
+    while True:
+        chunk = stream.read1(STDIN_CHUNK_SIZE)
+        if not chunk:
+            break
+        lines = chunk.split(b"\n")
+        lines[0] = pending + lines[0]
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def main():
+    """Main loop: read JSON-RPC from stdin, write to stdout.
+
+    Requests are handled concurrently so a slow fetch doesn't hold up the
+    ones behind it; responses are written as they complete and matched to
+    requests by id.
+    """
+    # Resolve each host once per DNS_TTL instead of once per connection
+    socket.getaddrinfo = getaddrinfo_cached
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for line in iter_lines(sys.stdin.buffer):
+            line = line.strip()
+            if not line:
+                continue
+
+            # Lines stay bytes; both orjson and json parse UTF-8 directly
+            try:
+                request = json_loads(line)
+            except ValueError:
+                continue
 
-        response = {"jsonrpc": "2.0", "id": request.get("id")}
-        if error:
-            response["error"] = error
-        else:
-            response["result"] = result
+            if not isinstance(request, dict):
+                write_response(None, error={"code": -32600, "message": "Invalid Request"})
+                continue
 
-        print(json.dumps(response), flush=True)
+            future = executor.submit(handle_message, request)
+            future.add_done_callback(partial(report_failure, request))
 
 
 if __name__ == "__main__":